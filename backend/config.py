@@ -4,6 +4,8 @@ All configurable values are centralized here for easy maintenance.
 Please note that we are not using environment variables for configuration in this project as it would then require the reviewer to first set the env variables before running the code, complicating the review process.
 """
 
+import re
+
 # Server Configuration
 HOST = "0.0.0.0"
 PORT = 8000
@@ -17,26 +19,60 @@ SELECTOR_WAIT_TIMEOUT = 2000  # Wait for specific selectors in milliseconds
 
 # Content Thresholds
 MIN_CONTENT_LENGTH = 500  # Minimum content length to consider JS rendering unnecessary
+JS_PREFILTER_CHARS = 65536  # Leading characters scanned for SPA/JS-required markers before parsing
 MIN_SEMANTIC_CONTENT_LENGTH = 2000  # Minimum content for high script count tolerance
 MAX_SCRIPT_COUNT_THRESHOLD = 20  # Maximum scripts before requiring more content
 MAX_RAW_HTML_LENGTH = 5000  # Maximum length of raw HTML to store per section
 MAX_INTERACTION_DEPTH = 3  # Maximum depth for pagination/scrolls/clicks
 MAX_URL_LENGTH = 2048  # Maximum allowed URL length (security)
+PARALLEL_EXTRACT_WORKERS = 0  # Threads extracting landmark content (0/1 = sequential; helps free-threaded builds)
+PARALLEL_EXTRACT_MIN_LANDMARKS = 4  # Fewer landmarks than this never start a thread pool
 
 # Interaction Configuration
 MAX_TABS_TO_CLICK = 5  # Maximum number of tabs to click
 MAX_TEXT_PREVIEW_LENGTH = 50  # Maximum length of text preview in interaction logs
-TAB_CLICK_DELAY = 0.5  # Delay in seconds between tab clicks
-LOAD_MORE_WAIT_TIME = 2  # Wait time in seconds after clicking load more
-SCROLL_WAIT_TIME = 2  # Wait time in seconds after scroll
-PAGINATION_WAIT_TIME = 1  # Wait time in seconds after pagination
+TAB_CLICK_DELAY = 0.5  # Max wait in seconds for tab content after a click
+LOAD_MORE_WAIT_TIME = 2  # Max wait in seconds for new elements after clicking load more
+SCROLL_WAIT_TIME = 2  # Max wait in seconds for the page to grow after scroll
+PAGINATION_WAIT_TIME = 1  # Max wait in seconds for client-side pagination to re-render
+DOM_SETTLE_TIME = 1  # Max wait in seconds for requests to finish once new elements appear
+
+# Result Cache Configuration
+RESULT_CACHE_SIZE = 256  # Maximum number of cached scrape results
+RESULT_CACHE_TTL = 600  # Seconds a successful result is reused
+ERROR_CACHE_TTL = 30  # Seconds a failed result is reused (short, so transient errors don't pin)
+ROBOTS_CACHE_SIZE = 512  # Maximum number of hosts whose robots.txt is kept
+ROBOTS_CACHE_TTL = 3600  # Seconds a host's robots.txt is reused
+
+# Robots.txt Compliance
+STRICT_ROBOTS_CHECK = False  # True: send no page request before robots.txt allows it (no concurrent fetch)
+
+# HTTP Client Configuration (shared across static scrapes and robots.txt checks)
+HTTP_MAX_CONNECTIONS = 100  # Total open connections across all hosts
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20  # Idle connections kept for reuse
+HTTP_KEEPALIVE_EXPIRY = 60  # Seconds an idle connection stays open
 
 # Browser Configuration
 VIEWPORT_WIDTH = 1920
 VIEWPORT_HEIGHT = 1080
+CONTEXT_POOL_SIZE = 4  # Pre-warmed browser contexts (extra concurrent scrapes get temporary ones)
+CONTEXT_MAX_USES = 20  # Scrapes served by a pooled context before it is replaced
+
+# Resources aborted in the browser (parsing only needs HTML/CSS/JS)
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_HOSTS = [
+    "doubleclick.net",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "facebook.net",
+    "hotjar.com",
+    "scorecardresearch.com",
+]
 
 # Main Content Selectors for Dynamic Waiting
-MAIN_CONTENT_SELECTORS = ["main", "article", '[role="main"]', "#content", ".content"]
+MAIN_CONTENT_SELECTORS = ("main", "article", '[role="main"]', "#content", ".content")
 
 # HTTP Headers
 USER_AGENT = (
@@ -53,7 +89,7 @@ DEFAULT_HEADERS = {
 }
 
 # Noise Removal Selectors
-NOISE_SELECTORS = [
+NOISE_SELECTORS = (
     "script",
     "style",
     "noscript",
@@ -68,7 +104,8 @@ NOISE_SELECTORS = [
     ".advertisement",
     ".ad-container",
     "[class*='consent']",
-]
+)
+NOISE_SELECTOR_STR = ",".join(NOISE_SELECTORS)  # One combined selector for a single select() pass
 
 # JS Detection Phrases
 JS_REQUIRED_PHRASES = [
@@ -79,6 +116,25 @@ JS_REQUIRED_PHRASES = [
     "requires javascript",
     "javascript is not enabled",
 ]
+JS_REQUIRED_RE = re.compile("|".join(re.escape(p) for p in JS_REQUIRED_PHRASES), re.I)
+
+# Stricter phrases only trusted inside <noscript>
+NOSCRIPT_JS_PHRASES = ["enable javascript", "without javascript", "javascript is required"]
+NOSCRIPT_JS_RE = re.compile("|".join(re.escape(p) for p in NOSCRIPT_JS_PHRASES), re.I)
+
+# Script src fragments that indicate bundled SPA code (webpack, next, vite, etc.)
+BUNDLER_KEYWORDS = [
+    "bundle",
+    "chunk",
+    "webpack",
+    "main.",
+    "next",
+    "app.",
+    "vendor",
+    "_next",
+    "vite",
+]
+BUNDLER_SRC_RE = re.compile("|".join(re.escape(k) for k in BUNDLER_KEYWORDS), re.I)
 
 # Interactive Elements for Interaction Detection
 INTERACTIVE_SELECTORS = {
@@ -114,6 +170,13 @@ SECTION_TYPE_KEYWORDS = {
     "list": ["list", "items"],
     "grid": ["grid", "gallery", "cards"],
 }
+# Flattened (keyword, type) pairs in priority order, built once for the classifier
+SECTION_TYPE_FLAT = [
+    (keyword, section_type)
+    for section_type, keywords in SECTION_TYPE_KEYWORDS.items()
+    for keyword in keywords
+]
+SECTION_TYPE_CACHE_SIZE = 4096  # Distinct tag/class/id combinations whose section type is memoized
 
 # Frontend Static File Path
 FRONTEND_DIST_PATH = "frontend/dist"
@@ -10,10 +10,16 @@ from pathlib import Path
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from playwright.async_api import async_playwright
 
 from backend.config import HOST, PORT, FRONTEND_DIST_PATH
 from backend.models import ScrapeRequestExtended, ScrapeResult
+from backend.scraper.browser import ContextPool
+from backend.scraper.cache import ScrapeCache
+from backend.scraper.http_client import get_client, close_client
 
 # Fix MIME type for JavaScript files
 mimetypes.add_type("application/javascript", ".js")
@@ -23,8 +29,15 @@ app = FastAPI(
     title="LyftrAI Assignment",
     description="Advanced web scraping API with static and dynamic rendering support",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
+# Recent results keyed by (normalized URL, interaction options)
+scrape_cache = ScrapeCache()
+
+# Compress large JSON results (section text and raw HTML compress well)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # CORS middleware (for development)
 app.add_middleware(
     CORSMiddleware,
@@ -35,13 +48,58 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def start_http_client():
+    """Open the pooled HTTP/2 client reused by every static scrape and robots.txt check."""
+    app.state.http = await get_client()
+
+
+@app.on_event("shutdown")
+async def stop_http_client():
+    """Close the shared HTTP client and its pooled connections."""
+    await close_client()
+
+
+@app.on_event("startup")
+async def start_browser():
+    """Launch one shared Chromium instance and pre-warm a pool of its contexts."""
+    app.state.playwright = None
+    app.state.browser = None
+    app.state.context_pool = None
+    try:
+        app.state.playwright = await async_playwright().start()
+        app.state.browser = await app.state.playwright.chromium.launch(headless=True)
+        app.state.context_pool = ContextPool(app.state.browser)
+        await app.state.context_pool.start()
+    except Exception:
+        # Keep serving; scrape_dynamic launches its own browser (and reports errors) per call
+        app.state.context_pool = None
+        if app.state.browser:
+            await app.state.browser.close()
+            app.state.browser = None
+        if app.state.playwright:
+            await app.state.playwright.stop()
+            app.state.playwright = None
+
+
+@app.on_event("shutdown")
+async def stop_browser():
+    """Close pooled contexts, the shared browser and the Playwright driver."""
+    if app.state.context_pool:
+        await app.state.context_pool.close()
+    if app.state.browser:
+        await app.state.browser.close()
+    if app.state.playwright:
+        await app.state.playwright.stop()
+
+
 @app.get("/healthz")
 async def health_check():
     """Health check endpoint"""
     return {"status": "ok"}
 
 
-@app.post("/scrape", response_model=ScrapeResult)
+@app.post("/scrape", response_model=ScrapeResult, response_class=ORJSONResponse)
 async def scrape_url_endpoint(request: ScrapeRequestExtended):
     """
     Main scraping endpoint - accepts URL and returns structured data.
@@ -52,16 +110,20 @@ async def scrape_url_endpoint(request: ScrapeRequestExtended):
     3. Optionally handle interactions (clicks, scrolls, pagination) for depth >= 3
     4. Always returns a result (may contain errors)
 
+    Results are cached briefly per (URL, interaction options); concurrent
+    requests for the same key share one scrape.
+
     Args:
         request: ScrapeRequestExtended with URL and interaction options
 
     Returns:
-        ScrapeResult: Structured scraping result with sections and metadata
+        ScrapeResult serialized directly (response_model only documents the schema;
+        the result is built by the backend, so FastAPI's re-validation pass is skipped)
 
     Raises:
         HTTPException: If URL scheme is invalid
     """
-    from backend.scraper import scrape_url
+    from backend.scraper import scrape_url, normalize_url
 
     # Validate URL scheme
     if not request.url.startswith(("http://", "https://")):
@@ -69,14 +131,24 @@ async def scrape_url_endpoint(request: ScrapeRequestExtended):
             status_code=400, detail="Only http:// and https:// URLs are supported"
         )
 
-    # Perform scraping with fallback
-    result = await scrape_url(
-        request.url,
-        enable_interactions=request.enable_interactions,
-        interaction_strategy=request.interaction_strategy,
+    # Perform scraping with fallback (or reuse a recent result)
+    cache_key = (
+        normalize_url(request.url),
+        request.enable_interactions,
+        request.interaction_strategy,
+    )
+    result = await scrape_cache.get_or_scrape(
+        cache_key,
+        lambda: scrape_url(
+            request.url,
+            enable_interactions=request.enable_interactions,
+            interaction_strategy=request.interaction_strategy,
+            context_pool=app.state.context_pool,
+            client=app.state.http,
+        ),
     )
 
-    return result
+    return ORJSONResponse(result.model_dump(mode="json"))
 
 
 # Serve React frontend static files
@@ -3,12 +3,20 @@ Scraper package initialization.
 Exposes main scraping functions and utilities.
 """
 
+from backend.scraper.browser import ContextPool
+from backend.scraper.cache import ScrapeCache
 from backend.scraper.dynamic import scrape_dynamic
+from backend.scraper.http_client import get_client, close_client
 from backend.scraper.interactions import handle_interactions, normalize_url
 from backend.scraper.parser import extract_meta, parse_html
 from backend.scraper.scraper import scrape_url
 from backend.scraper.static import scrape_static
-from backend.scraper.utils import check_robots_txt, needs_js_rendering, validate_url
+from backend.scraper.utils import (
+    check_robots_txt,
+    markup_needs_js,
+    needs_js_rendering,
+    validate_url,
+)
 
 __all__ = [
     "scrape_url",
@@ -21,4 +29,9 @@ __all__ = [
     "validate_url",
     "check_robots_txt",
     "needs_js_rendering",
+    "markup_needs_js",
+    "ContextPool",
+    "ScrapeCache",
+    "get_client",
+    "close_client",
 ]
@@ -0,0 +1,164 @@
+"""Pooled Playwright browser contexts shared across dynamic scrapes."""
+
+__all__ = ["ContextPool", "new_scraping_context"]
+
+import asyncio
+from typing import Dict, Set
+from urllib.parse import urlparse
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Route,
+    Error as PlaywrightError,
+)
+
+from backend.config import (
+    BLOCKED_HOSTS,
+    BLOCKED_RESOURCE_TYPES,
+    CONTEXT_POOL_SIZE,
+    CONTEXT_MAX_USES,
+    USER_AGENT,
+    VIEWPORT_WIDTH,
+    VIEWPORT_HEIGHT,
+)
+
+
+# True if the page's origin keeps IndexedDB databases (storage_state() does not report them)
+HAS_INDEXED_DB_JS = """async () => {
+    if (!indexedDB.databases) return false;
+    return (await indexedDB.databases()).length > 0;
+}"""
+
+
+def _is_blocked_host(host: str) -> bool:
+    """True for ad/analytics hosts (or their subdomains) listed in BLOCKED_HOSTS."""
+    return any(host == blocked or host.endswith("." + blocked) for blocked in BLOCKED_HOSTS)
+
+
+async def _block_heavy_resources(route: Route) -> None:
+    """Aborts images, fonts, media and tracker requests; lets everything else through."""
+    request = route.request
+    try:
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or _is_blocked_host(
+            urlparse(request.url).hostname or ""
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+    except PlaywrightError:
+        # Page or context closed while the request was in flight
+        pass
+
+
+async def _holds_site_storage(context: BrowserContext) -> bool:
+    """True if a site left localStorage or IndexedDB data behind in the context."""
+    state = await context.storage_state()
+    if state["origins"]:
+        return True
+    for page in context.pages:
+        if await page.evaluate(HAS_INDEXED_DB_JS):
+            return True
+    return False
+
+
+async def new_scraping_context(browser: Browser) -> BrowserContext:
+    """Creates a browser context with the scraper's viewport, user agent and resource blocking."""
+    context = await browser.new_context(
+        viewport={"width": VIEWPORT_WIDTH, "height": VIEWPORT_HEIGHT},
+        user_agent=USER_AGENT,
+        # Service workers would outlive a scrape in a pooled context
+        service_workers="block",
+    )
+    await context.route("**/*", _block_heavy_resources)
+    return context
+
+
+class ContextPool:
+    """
+    Bounded pool of pre-warmed browser contexts.
+
+    Contexts are reset (pages closed, cookies and permissions cleared) on
+    release. A context a site stored data in (localStorage, IndexedDB) is
+    replaced by a fresh one instead, as is one that served max_uses scrapes,
+    so no state carries over between scrapes.
+    When all of them are in use, acquire() opens a temporary overflow
+    context that release() closes instead of pooling.
+    """
+
+    def __init__(
+        self,
+        browser: Browser,
+        size: int = CONTEXT_POOL_SIZE,
+        max_uses: int = CONTEXT_MAX_USES,
+    ):
+        self.browser = browser
+        self.size = size
+        self.max_uses = max_uses
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self._uses: Dict[BrowserContext, int] = {}
+        self._overflow: Set[BrowserContext] = set()
+
+    async def start(self) -> None:
+        """Fills the pool with pre-warmed contexts."""
+        for _ in range(self.size):
+            await self._add_context()
+
+    async def acquire(self) -> BrowserContext:
+        """Returns a free pooled context, or a temporary one if the pool is exhausted."""
+        try:
+            return self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            context = await new_scraping_context(self.browser)
+            self._overflow.add(context)
+            return context
+
+    async def release(self, context: BrowserContext) -> None:
+        """Resets a context and returns it to the pool, rotating worn-out, used or broken ones."""
+        if context in self._overflow:
+            self._overflow.discard(context)
+            try:
+                await context.close()
+            except Exception:
+                pass
+            return
+
+        uses = self._uses.pop(context, 0) + 1
+
+        try:
+            if uses < self.max_uses and not await _holds_site_storage(context):
+                for page in context.pages:
+                    await page.close()
+                await context.clear_cookies()
+                await context.clear_permissions()
+                self._uses[context] = uses
+                self._queue.put_nowait(context)
+                return
+        except Exception:
+            pass
+
+        # Replace with a fresh context
+        try:
+            await context.close()
+        except Exception:
+            pass
+        try:
+            await self._add_context()
+        except Exception:
+            # Browser is gone - pool shrinks and acquire() fails creating an overflow context
+            pass
+
+    async def close(self) -> None:
+        """Closes every idle context in the pool."""
+        while not self._queue.empty():
+            context = self._queue.get_nowait()
+            self._uses.pop(context, None)
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    async def _add_context(self) -> None:
+        context = await new_scraping_context(self.browser)
+        self._uses[context] = 0
+        self._queue.put_nowait(context)
@@ -0,0 +1,92 @@
+"""TTL cache for scrape results with single-flight per key."""
+
+__all__ = ["ScrapeCache", "SingleFlight"]
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional
+
+from cachetools import TTLCache
+
+from backend.config import RESULT_CACHE_SIZE, RESULT_CACHE_TTL, ERROR_CACHE_TTL
+from backend.models import ScrapeResult
+
+
+class SingleFlight:
+    """
+    One asyncio lock per key, kept only while some caller holds or waits on it.
+
+    Callers that miss a cache take the key's lock and re-check the cache
+    inside it, so concurrent misses share one fetch.
+    """
+
+    def __init__(self):
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        # Callers holding or waiting on each key's lock; it is dropped at zero
+        self._waiters: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        """Number of keys with a lock in use."""
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[None]:
+        """Holds key's lock for the body of the async with block."""
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            # A released lock may still have queued waiters, so count callers instead
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                del self._locks[key]
+
+
+class ScrapeCache:
+    """
+    Caches ScrapeResults by key with time-based expiry.
+
+    Results without sections but with errors are kept for the shorter
+    error_ttl so transient failures don't pin. Concurrent misses for the
+    same key wait on one scrape instead of stampeding the target site.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = RESULT_CACHE_SIZE,
+        ttl: float = RESULT_CACHE_TTL,
+        error_ttl: float = ERROR_CACHE_TTL,
+    ):
+        self._results = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._failures = TTLCache(maxsize=maxsize, ttl=error_ttl)
+        self._flights = SingleFlight()
+
+    def get(self, key: Hashable) -> Optional[ScrapeResult]:
+        """Returns the cached result for key, or None if missing/expired."""
+        return self._results.get(key) or self._failures.get(key)
+
+    def put(self, key: Hashable, result: ScrapeResult) -> None:
+        """Stores a result, using the short TTL for failed scrapes."""
+        if not result.sections and result.errors:
+            self._failures[key] = result
+        else:
+            self._results[key] = result
+
+    async def get_or_scrape(
+        self, key: Hashable, scrape: Callable[[], Awaitable[ScrapeResult]]
+    ) -> ScrapeResult:
+        """Returns the cached result or runs scrape() once for all concurrent callers."""
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        async with self._flights.hold(key):
+            # Another caller may have filled the cache while we waited
+            result = self.get(key)
+            if result is None:
+                result = await scrape()
+                self.put(key, result)
+            return result
@@ -9,34 +9,60 @@ from typing import Optional
 from playwright.async_api import (
     async_playwright,
     Browser,
+    BrowserContext,
+    Playwright,
+    Response,
     TimeoutError as PlaywrightTimeout,
+    Error as PlaywrightError,
 )
 
 from backend.config import (
     PAGE_LOAD_TIMEOUT,
     NETWORK_IDLE_TIMEOUT,
-    USER_AGENT,
     SELECTOR_WAIT_TIMEOUT,
-    VIEWPORT_WIDTH,
-    VIEWPORT_HEIGHT,
     MAIN_CONTENT_SELECTORS,
 )
 from backend.models import ScrapeResult, Meta, ScrapeError, Interactions
-from backend.scraper.interactions import handle_interactions
-from backend.scraper.parser import parse_html, extract_meta
+from backend.scraper.browser import ContextPool, new_scraping_context
+from backend.scraper.interactions import handle_interactions, InteractionResult
+from backend.scraper.parser import make_tree, parse_html, extract_meta
+from backend.scraper.utils import needs_js_rendering
+
+
+async def _release_context(
+    context: BrowserContext, context_pool: Optional[ContextPool]
+) -> None:
+    """Returns a pooled context for reuse, or closes a private one."""
+    if context_pool:
+        await context_pool.release(context)
+    else:
+        await context.close()
+
+
+async def _static_body(response: Response) -> Optional[str]:
+    """Returns the served HTML if it needs no JS rendering (per needs_js_rendering), else None."""
+    try:
+        body = await response.text()
+    except PlaywrightError:
+        return None
+    return None if needs_js_rendering(body) else body
 
 
 async def scrape_dynamic(
-    url: str, enable_interactions: bool = False, interaction_strategy: str = "auto"
+    url: str,
+    enable_interactions: bool = False,
+    interaction_strategy: str = "auto",
+    context_pool: Optional[ContextPool] = None,
 ) -> Optional[ScrapeResult]:
     """
     Playwright-based scraping for JS-heavy sites.
-    Launches headless Chrome, waits for content, optionally handles interactions.
+    Opens an isolated browser context, waits for content, optionally handles interactions.
 
     Args:
         url: Target URL
         enable_interactions: Enable depth ≥ 3 interactions
         interaction_strategy: Interaction mode ('auto', 'tabs', 'load_more', 'scroll', 'pagination', 'all')
+        context_pool: Shared pool of pre-warmed contexts; a private browser is launched if omitted
 
     Returns:
         ScrapeResult or None if failed
@@ -44,40 +70,53 @@ async def scrape_dynamic(
     errors = []
     pages_visited = []
 
+    playwright: Optional[Playwright] = None
     browser: Optional[Browser] = None
+    context: Optional[BrowserContext] = None
 
     try:
-        async with async_playwright() as p:
-            # Launch browser
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                viewport={"width": VIEWPORT_WIDTH, "height": VIEWPORT_HEIGHT},
-                user_agent=USER_AGENT,
+        if context_pool:
+            context = await context_pool.acquire()
+        else:
+            # No shared pool - launch a private browser for this call
+            playwright = await async_playwright().start()
+            browser = await playwright.chromium.launch(headless=True)
+            context = await new_scraping_context(browser)
+        page = await context.new_page()
+
+        # Navigate to URL
+        response = None
+        try:
+            response = await page.goto(
+                url, wait_until="domcontentloaded", timeout=PAGE_LOAD_TIMEOUT
             )
-            page = await context.new_page()
-
-            # Navigate to URL
-            try:
-                response = await page.goto(
-                    url, wait_until="domcontentloaded", timeout=PAGE_LOAD_TIMEOUT
-                )
-                if response and not response.ok:
-                    errors.append(
-                        ScrapeError(
-                            message=f"HTTP {response.status}: Page load failed",
-                            phase="dynamic",
-                        )
-                    )
-                pages_visited.append(page.url)
-            except PlaywrightTimeout:
+            if response and not response.ok:
                 errors.append(
                     ScrapeError(
-                        message=f"Page load timed out after {PAGE_LOAD_TIMEOUT / 1000}s",
+                        message=f"HTTP {response.status}: Page load failed",
                         phase="dynamic",
                     )
                 )
-                pages_visited.append(page.url)
-
+            pages_visited.append(page.url)
+        except PlaywrightTimeout:
+            errors.append(
+                ScrapeError(
+                    message=f"Page load timed out after {PAGE_LOAD_TIMEOUT / 1000}s",
+                    phase="dynamic",
+                )
+            )
+            pages_visited.append(page.url)
+
+        # Fast path: served HTML already has enough static content - skip rendering waits
+        html = None
+        strategy = "js"
+        interaction_results = None
+        if not enable_interactions and response and response.ok:
+            html = await _static_body(response)
+            if html is not None:
+                strategy = "static"
+
+        if html is None:
             # Wait strategy: best effort, continue on timeout
             try:
                 await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT)
@@ -98,37 +137,40 @@ async def scrape_dynamic(
             await asyncio.sleep(1)
 
             # Handle interactions if enabled
-            interaction_results = await handle_interactions(page, strategy=interaction_strategy) if enable_interactions else {}
-            pages_visited = interaction_results.get("pages", [page.url])
-            html_contents = interaction_results.get("html_contents", [])
+            if enable_interactions:
+                interaction_results = await handle_interactions(page, strategy=interaction_strategy)
 
             # Extract rendered HTML
             html = await page.content()
-            final_url = page.url
 
-            # Close browser
-            await browser.close()
-            browser = None
+        if interaction_results is None:
+            interaction_results = InteractionResult(pages=[page.url])
+        pages_visited = interaction_results.pages
+        final_url = page.url
+
+        # Release browser resources before the CPU-bound parsing
+        await _release_context(context, context_pool)
+        context = None
 
         # Extract metadata and parse HTML - let errors bubble up
-        meta = extract_meta(html, final_url, strategy="js")
+        root = make_tree(html)
+        meta = extract_meta(root, final_url, strategy=strategy)
         sections = []
 
         # Parse HTML sections
-        if enable_interactions and html_contents:
-            for i, page_html in enumerate(html_contents):
-                page_url = pages_visited[i] if i < len(pages_visited) else final_url
-                page_sections = parse_html(page_html, page_url)
+        if enable_interactions and interaction_results.page_sections:
+            # Pagination already parsed each page as it was visited
+            for i, (_, page_sections) in enumerate(interaction_results.page_sections):
                 for section in page_sections:
                     section.id = f"{section.id}-p{i}"
                 sections.extend(page_sections)
         else:
-            sections = parse_html(html, final_url)
+            sections = parse_html(root, final_url)
 
         # Build result
         interactions = Interactions(
-            clicks=interaction_results.get("clicks", []),
-            scrolls=interaction_results.get("scrolls", 0),
+            clicks=interaction_results.clicks,
+            scrolls=interaction_results.scrolls,
             pages=pages_visited,
         )
 
@@ -147,9 +189,18 @@ async def scrape_dynamic(
                 message=f"Dynamic scraping error: {str(e)}", phase="dynamic"
             )
         )
-        if browser:
+        return None
+
+    finally:
+        if context:
             try:
-                await browser.close()
+                await _release_context(context, context_pool)
+            except Exception:
+                pass
+        if playwright:
+            try:
+                if browser:
+                    await browser.close()
+                await playwright.stop()
             except Exception:
                 pass
-        return None
@@ -0,0 +1,47 @@
+"""Shared pooled httpx client for static scrapes and robots.txt checks."""
+
+__all__ = ["get_client", "close_client"]
+
+import asyncio
+import weakref
+
+import httpx
+
+from backend.config import (
+    STATIC_TIMEOUT,
+    DEFAULT_HEADERS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+)
+
+# One client per event loop: its pooled connections belong to the loop that opened them
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def get_client() -> httpx.AsyncClient:
+    """Returns the running loop's shared HTTP/2 client, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(
+            http2=True,
+            headers=DEFAULT_HEADERS,
+            timeout=STATIC_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            follow_redirects=True,
+        )
+    return client
+
+
+async def close_client() -> None:
+    """Closes the running loop's shared client; the next get_client() opens a fresh one."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -1,9 +1,11 @@
 """Depth ≥ 3 interaction handlers: tabs, load more, scroll, pagination."""
 
-__all__ = ["handle_interactions", "normalize_url"]
+__all__ = ["handle_interactions", "InteractionResult", "normalize_url"]
 
-from typing import List, Tuple
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Tuple
 from playwright.async_api import (
+    Locator,
     Page,
     TimeoutError as PlaywrightTimeout,
     Error as PlaywrightError,
@@ -20,33 +22,137 @@ from backend.config import (
     LOAD_MORE_WAIT_TIME,
     SCROLL_WAIT_TIME,
     PAGINATION_WAIT_TIME,
+    DOM_SETTLE_TIME,
 )
+from backend.models import Section
+from backend.scraper.parser import parse_html
 
 # Extract selectors from config
 TAB_SELECTORS = INTERACTIVE_SELECTORS["tabs"]
 LOAD_MORE_SELECTORS = INTERACTIVE_SELECTORS["load_more"]
 PAGINATION_SELECTORS = INTERACTIVE_SELECTORS["pagination"]
+TAB_COMBINED = ", ".join(TAB_SELECTORS)
+
+# One querySelectorAll over all tab selectors. Each element is bucketed under the
+# first selector it matches, so config order still decides which tabs get clicked.
+# Returns, per selector, up to `limit` [nth match of that selector, label] pairs.
+TAB_LABELS_JS = """([combined, selectors, limit, previewLength]) => {
+    const tabs = selectors.map(() => []);
+    const counts = selectors.map(() => 0);
+    for (const el of document.querySelectorAll(combined)) {
+        let owner = -1;
+        for (let i = 0; i < selectors.length; i++) {
+            if (!el.matches(selectors[i])) continue;
+            if (owner < 0) {
+                owner = i;
+                if (tabs[i].length < limit)
+                    tabs[i].push([counts[i], (el.innerText || '').trim().slice(0, previewLength)]);
+            }
+            counts[i]++;
+        }
+    }
+    return tabs;
+}"""
+
+# Counts elements added to the DOM, so growth checks don't walk the whole tree
+WATCH_ADDED_NODES_JS = """() => {
+    if (!window.__scraperObserver) {
+        window.__scraperObserver = new MutationObserver(records => {
+            for (const r of records)
+                for (const n of r.addedNodes)
+                    if (n.nodeType === 1) window.__scraperAdded++;
+        });
+        window.__scraperObserver.observe(document.body, {childList: true, subtree: true});
+    }
+    window.__scraperAdded = 0;
+}"""
+# Resolves (and resets the counter) once elements were added; a fresh document
+# without the observer counts as changed since navigation already completed
+DOM_GREW_JS = """() => {
+    if (window.__scraperAdded === undefined) return true;
+    if (window.__scraperAdded > 0) {
+        window.__scraperAdded = 0;
+        return true;
+    }
+    return false;
+}"""
+
+# Scrolls to the bottom and reports the height scrolled to, in one round trip
+SCROLL_TO_BOTTOM_JS = """() => {
+    const height = document.body.scrollHeight;
+    window.scrollTo(0, height);
+    return height;
+}"""
+
+
+@dataclass(slots=True)
+class InteractionResult:
+    """Outcome of handle_interactions: clicks, scrolls, visited pages and per-page sections."""
+
+    clicks: List[str] = field(default_factory=list)
+    scrolls: int = 0
+    pages: List[str] = field(default_factory=list)
+    page_sections: List[Tuple[str, List[Section]]] = field(default_factory=list)
+
+
+async def _probe_visible(locators: List[Locator]) -> List[bool]:
+    """Checks visibility of all locators concurrently; failed checks count as hidden."""
+    results = await asyncio.gather(
+        *(locator.is_visible() for locator in locators), return_exceptions=True
+    )
+    return [result is True for result in results]
+
+
+async def _wait_for_dom_growth(page: Page, timeout: float) -> bool:
+    """
+    Waits up to timeout seconds for the DOM to grow; returns False if it didn't.
+    After growth, waits up to DOM_SETTLE_TIME for the page's requests to finish.
+    """
+    try:
+        await page.wait_for_function(DOM_GREW_JS, timeout=timeout * 1000)
+    except PlaywrightTimeout:
+        return False
+
+    # The first added element may just be a spinner: let the content arrive
+    try:
+        await page.wait_for_load_state("networkidle", timeout=DOM_SETTLE_TIME * 1000)
+    except PlaywrightTimeout:
+        pass
+    # Elements added while settling must not count as growth from the next action
+    await page.evaluate(WATCH_ADDED_NODES_JS)
+    return True
 
 
 async def try_click_tabs(page: Page) -> List[str]:
     """Clicks up to MAX_TABS_TO_CLICK tabs to reveal hidden content."""
     clicks = []
 
-    # Try to find tab containers
-    for selector in TAB_SELECTORS:
-        try:
-            tabs = await page.query_selector_all(selector)
+    try:
+        await page.evaluate(WATCH_ADDED_NODES_JS)
+    except PlaywrightError:
+        pass
 
-            if not tabs:
+    # Find tabs for all selectors with a single combined query
+    try:
+        found = await page.evaluate(
+            TAB_LABELS_JS,
+            [TAB_COMBINED, TAB_SELECTORS, MAX_TABS_TO_CLICK, MAX_TEXT_PREVIEW_LENGTH],
+        )
+    except PlaywrightError:
+        return clicks
+
+    for selector, entries in zip(TAB_SELECTORS, found):
+        try:
+            if not entries:
                 continue
 
-            # Click each tab (up to configured maximum)
-            for i, tab in enumerate(tabs[:MAX_TABS_TO_CLICK]):
+            # Click each tab (entries are already capped at MAX_TABS_TO_CLICK)
+            tabs = page.locator(selector)
+            for nth, text in entries:
                 try:
-                    text = (await tab.inner_text()).strip()[:MAX_TEXT_PREVIEW_LENGTH]
-                    await tab.click(timeout=INTERACTION_TIMEOUT)
+                    await tabs.nth(nth).click(timeout=INTERACTION_TIMEOUT)
                     clicks.append(f"Tab clicked: {selector} - {text}")
-                    await asyncio.sleep(TAB_CLICK_DELAY)
+                    await _wait_for_dom_growth(page, TAB_CLICK_DELAY)
 
                 except (PlaywrightTimeout, PlaywrightError):
                     continue
@@ -68,30 +174,34 @@ async def try_click_load_more(
     clicks = []
     click_count = 0
 
+    try:
+        await page.evaluate(WATCH_ADDED_NODES_JS)
+    except PlaywrightError:
+        return clicks, click_count
+
+    # Resolve locators once; they re-query lazily on each use
+    locators = [page.locator(selector).first for selector in LOAD_MORE_SELECTORS]
+
     for attempt in range(max_clicks):
         clicked = False
 
-        # Try each selector
-        for selector in LOAD_MORE_SELECTORS:
-            try:
-                button = await page.query_selector(selector)
-                if not button or not await button.is_visible():
-                    continue
+        # Probe all selectors at once, then try them in priority order
+        visible = await _probe_visible(locators)
+
+        for button, is_visible in zip(locators, visible):
+            if not is_visible:
+                continue
 
-                text = (await button.inner_text()).strip()[:MAX_TEXT_PREVIEW_LENGTH]
-                # Store element count instead of full HTML for efficiency
-                element_count_before = await page.evaluate("() => document.querySelectorAll('*').length")
-                
+            try:
+                text = await button.inner_text(timeout=INTERACTION_TIMEOUT)
+                text = text.strip()[:MAX_TEXT_PREVIEW_LENGTH]
                 await button.click(timeout=INTERACTION_TIMEOUT)
                 clicks.append(f"Load more clicked ({attempt + 1}): {text}")
                 click_count += 1
                 clicked = True
-                
-                await asyncio.sleep(LOAD_MORE_WAIT_TIME)
-                
-                # Check if new elements were added
-                element_count_after = await page.evaluate("() => document.querySelectorAll('*').length")
-                if element_count_after <= element_count_before:
+
+                # Stop once a click no longer adds elements
+                if not await _wait_for_dom_growth(page, LOAD_MORE_WAIT_TIME):
                     return clicks, click_count
                 break
 
@@ -112,11 +222,12 @@ async def try_infinite_scroll(
     scroll_count = 0
     previous_height = 0
     visited_urls = []
+    seen_urls = set()
 
     for attempt in range(max_scrolls):
         try:
-            # Get current scroll height
-            current_height = await page.evaluate("() => document.body.scrollHeight")
+            # Scroll to bottom, reading the current scroll height in the same call
+            current_height = await page.evaluate(SCROLL_TO_BOTTOM_JS)
 
             # If height hasn't changed from last scroll, no new content
             if previous_height > 0 and current_height <= previous_height:
@@ -124,9 +235,6 @@ async def try_infinite_scroll(
 
             previous_height = current_height
 
-            # Scroll to bottom
-            await page.evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
-
             # Also try pressing End key to trigger some infinite scrolls that rely on keyboard events
             try:
                 await page.keyboard.press("End")
@@ -135,8 +243,14 @@ async def try_infinite_scroll(
 
             scroll_count += 1
 
-            # Wait for new content to load
-            await asyncio.sleep(SCROLL_WAIT_TIME)
+            # Wait for new content to extend the page (returns as soon as it does)
+            try:
+                await page.wait_for_function(
+                    f"() => document.body.scrollHeight > {current_height}",
+                    timeout=SCROLL_WAIT_TIME * 1000,
+                )
+            except PlaywrightTimeout:
+                pass
 
             # Optional: Wait for network to be idle
             try:
@@ -148,7 +262,8 @@ async def try_infinite_scroll(
 
             # Check if URL changed (some infinite scrolls update URL)
             current_url = page.url
-            if current_url not in visited_urls:
+            if current_url not in seen_urls:
+                seen_urls.add(current_url)
                 visited_urls.append(current_url)
 
         except (PlaywrightTimeout, PlaywrightError, Exception):
@@ -159,44 +274,52 @@ async def try_infinite_scroll(
 
 async def try_pagination(
     page: Page, max_pages: int = MAX_DEPTH
-) -> Tuple[List[str], int, List[str]]:
-    """Follows Next/pagination links up to max_pages, capturing HTML from each page."""
-    pages_visited = [page.url]
-    pages_count = 1
-    html_contents = []
+) -> AsyncIterator[Tuple[str, List[Section]]]:
+    """
+    Follows Next/pagination links up to max_pages, yielding (url, sections) per page.
+    Each page's HTML is parsed as soon as it is captured and then dropped.
+    """
+    seen_urls = {page.url}
 
-    # Capture initial page content
+    # Parse initial page content
     try:
         content = await page.content()
-        html_contents.append(content)
     except Exception:
-        pass
+        content = None
+    if content is not None:
+        url = page.url
+        yield url, parse_html(content, url)
+
+    # Resolve locators once; they re-query lazily on each use
+    locators = [page.locator(selector).first for selector in PAGINATION_SELECTORS]
 
     for attempt in range(max_pages - 1):  # -1 because we're already on page 1
         clicked = False
 
-        # Try each pagination selector
-        for selector in PAGINATION_SELECTORS:
-            try:
-                next_button = await page.query_selector(selector)
-                if not next_button or not await next_button.is_visible():
-                    continue
+        # Probe all pagination selectors at once, then try them in priority order
+        visible = await _probe_visible(locators)
+
+        for next_button, is_visible in zip(locators, visible):
+            if not is_visible:
+                continue
 
+            try:
                 url_before = page.url
+                await page.evaluate(WATCH_ADDED_NODES_JS)
                 await next_button.click(timeout=INTERACTION_TIMEOUT)
-                
+
                 try:
                     await page.wait_for_load_state("domcontentloaded", timeout=INTERACTION_TIMEOUT)
                 except PlaywrightTimeout:
-                    await asyncio.sleep(1)
+                    pass
 
                 url_after = page.url
-                if url_after != url_before and url_after not in pages_visited:
-                    pages_visited.append(url_after)
-                    pages_count += 1
+                if url_after != url_before and url_after not in seen_urls:
+                    seen_urls.add(url_after)
+                    # Full navigations return at once; client-side routing waits for re-render
+                    await _wait_for_dom_growth(page, PAGINATION_WAIT_TIME)
+                    content = await page.content()
                     clicked = True
-                    await asyncio.sleep(PAGINATION_WAIT_TIME)
-                    html_contents.append(await page.content())
                     break
 
             except (PlaywrightTimeout, PlaywrightError):
@@ -206,18 +329,32 @@ async def try_pagination(
         if not clicked:
             break
 
-    return pages_visited, pages_count, html_contents
+        yield url_after, parse_html(content, url_after)
 
 
-async def handle_interactions(page: Page, strategy: str = "auto") -> dict:
+async def handle_interactions(page: Page, strategy: str = "auto") -> InteractionResult:
     """
     Orchestrates depth ≥ 3 interactions: tabs, load more, scroll, pagination.
-    Returns dict with clicks, scrolls, pages, and html_contents.
+    Returns InteractionResult with clicks, scrolls, pages, and page_sections.
     """
     clicks = []
     scrolls = 0
     pages = [page.url]
-    html_contents = []
+    seen = {page.url}
+    page_sections = []
+
+    def add_pages(urls: List[str]) -> None:
+        """Appends unseen URLs, keeping first-visit order."""
+        for url in urls:
+            if url not in seen:
+                seen.add(url)
+                pages.append(url)
+
+    async def paginate() -> None:
+        """Collects sections page by page as pagination yields them."""
+        async for url, sections in try_pagination(page, max_pages=MAX_DEPTH):
+            add_pages([url])
+            page_sections.append((url, sections))
 
     try:
         if strategy in ["auto", "tabs", "all"]:
@@ -238,22 +375,11 @@ async def handle_interactions(page: Page, strategy: str = "auto") -> dict:
             scrolls = scroll_count
 
             # Add new pages
-            for p in scroll_pages:
-                if p not in pages:
-                    pages.append(p)
+            add_pages(scroll_pages)
 
         if strategy in ["auto", "pagination", "all"]:
             # Try pagination (this changes the URL)
-            pagination_pages, _, pagination_htmls = await try_pagination(
-                page, max_pages=MAX_DEPTH
-            )
-            # Add new pages (avoid duplicates)
-            for p in pagination_pages:
-                if p not in pages:
-                    pages.append(p)
-
-            # Add HTML contents
-            html_contents.extend(pagination_htmls)
+            await paginate()
 
         # For 'auto' strategy, if nothing worked, try remaining strategies as fallback
         if strategy == "auto" and not clicks and scrolls == 0 and len(pages) == 1:
@@ -262,30 +388,19 @@ async def handle_interactions(page: Page, strategy: str = "auto") -> dict:
                 page, max_scrolls=MAX_DEPTH
             )
             scrolls = scroll_count
-            for p in scroll_pages:
-                if p not in pages:
-                    pages.append(p)
+            add_pages(scroll_pages)
 
             # If scroll didn't work, try pagination
             if scrolls == 0:
-                pagination_pages, _, pagination_htmls = await try_pagination(
-                    page, max_pages=MAX_DEPTH
-                )
-                for p in pagination_pages:
-                    if p not in pages:
-                        pages.append(p)
-                html_contents.extend(pagination_htmls)
+                await paginate()
 
     except Exception:
         # Don't fail completely on interaction errors
         pass
 
-    return {
-        "clicks": clicks,
-        "scrolls": scrolls,
-        "pages": pages,
-        "html_contents": html_contents,
-    }
+    return InteractionResult(
+        clicks=clicks, scrolls=scrolls, pages=pages, page_sections=page_sections
+    )
 
 
 def normalize_url(url: str) -> str:
@@ -1,50 +1,120 @@
 """Unified HTML→Section parser for both static and dynamic scrapers."""
 
-__all__ = ["parse_html", "extract_meta"]
+__all__ = ["parse_html", "extract_meta", "make_tree"]
 
+import copy
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from io import StringIO
+from typing import Optional, Union
 from urllib.parse import urljoin
+from xml.sax.saxutils import escape
 
-from bs4 import BeautifulSoup, Tag, NavigableString
+try:
+    import ahocorasick
+except ImportError:  # Optional speedup; classify_section_type falls back to a keyword scan
+    ahocorasick = None
+from lxml import etree
+from lxml.cssselect import CSSSelector
+from lxml.html import HtmlElement, HTMLParser, document_fromstring
 
 from backend.models import Section, Content, LinkItem, ImageItem, Meta
 from backend.config import (
     MAX_RAW_HTML_LENGTH,
-    NOISE_SELECTORS,
-    SECTION_TYPE_KEYWORDS,
+    NOISE_SELECTOR_STR,
+    PARALLEL_EXTRACT_MIN_LANDMARKS,
+    PARALLEL_EXTRACT_WORKERS,
+    SECTION_TYPE_CACHE_SIZE,
+    SECTION_TYPE_FLAT,
 )
 
-
-def _safe_extract(extractor_func, default=""):
-    """Helper to extract data with fallback on failure."""
+_WS_RE = re.compile(r"\s+")
+
+# Compiled once: cssselect translation to XPath is far costlier than matching
+_NOISE_SELECTOR = CSSSelector(NOISE_SELECTOR_STR)
+_UTF8_PARSER = HTMLParser(encoding="utf-8")
+_TEXT_WALK_EVENTS = ("start", "end", "comment", "pi")
+# Target of the processing instructions clean_html leaves where it drops noise
+_DROPPED_MARKER = "scraper-dropped"
+# Meta fields as string values: "" when the element or attribute is missing
+_TITLE = etree.XPath("string((//title)[1])", smart_strings=False)
+_OG_TITLE = etree.XPath("string((//meta[@property='og:title'])[1]/@content)", smart_strings=False)
+_DESCRIPTION = etree.XPath("string((//meta[@name='description'])[1]/@content)", smart_strings=False)
+_OG_DESCRIPTION = etree.XPath(
+    "string((//meta[@property='og:description'])[1]/@content)", smart_strings=False
+)
+_CANONICAL = etree.XPath(
+    "string((//link[contains(concat(' ', normalize-space(@rel), ' '), ' canonical ')])[1]/@href)",
+    smart_strings=False,
+)
+_LINKS_WITH_HREF = etree.XPath(".//a[@href]")
+_TOP_LEVEL_LISTS = etree.XPath(".//*[self::ul or self::ol][not(ancestor::ul or ancestor::ol)]")
+# Cells of the first row in the first thead; rows outside any thead
+_HEADER_CELLS = etree.XPath("(.//thead)[1]/descendant::tr[1]/descendant::*[self::th or self::td]")
+_BODY_ROWS = etree.XPath(".//tr[not(ancestor::thead)]")
+_HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+_LANDMARK_TAGS = ("header", "nav", "main", "section", "article", "aside", "footer")
+_LANDMARK_PARENT_TAGS = ("header", "nav", "main", "section", "article", "footer")
+
+
+def _build_section_automaton():
+    """Aho-Corasick automaton mapping each keyword to (priority, section_type)."""
+    automaton = ahocorasick.Automaton()
+    for priority, (keyword, section_type) in enumerate(SECTION_TYPE_FLAT):
+        # A keyword listed twice keeps its highest-priority type
+        if keyword not in automaton:
+            automaton.add_word(keyword, (priority, section_type))
+    automaton.make_automaton()
+    return automaton
+
+
+_SECTION_AUTOMATON = _build_section_automaton() if ahocorasick else None
+
+
+def make_tree(html: Union[str, HtmlElement]) -> HtmlElement:
+    """Parses html into an lxml document root; an already-parsed root is returned as is."""
+    if isinstance(html, HtmlElement):
+        return html
     try:
-        result = extractor_func()
-        return result.strip() if result else default
-    except (AttributeError, TypeError, KeyError, IndexError):
-        return default
+        return document_fromstring(html)
+    except etree.ParserError:
+        # Empty or whitespace/comment-only document
+        return document_fromstring("<html></html>")
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        return document_fromstring(html.encode("utf-8"), parser=_UTF8_PARSER)
 
 
-def extract_meta(html: str, url: str, strategy: str = None) -> Meta:
-    """Extracts page metadata (title, description, language, canonical, strategy)."""
-    soup = BeautifulSoup(html, "lxml")
+def _first(element: HtmlElement, *tags: str) -> Optional[HtmlElement]:
+    """First descendant with one of tags, in document order."""
+    return next(element.iterdescendants(*tags), None)
 
-    title = (
-        _safe_extract(lambda: soup.find("title").get_text())
-        or _safe_extract(lambda: soup.find("meta", property="og:title")["content"])
-        or "Untitled"
-    )
 
-    description = _safe_extract(
-        lambda: soup.find("meta", attrs={"name": "description"})["content"]
-    ) or _safe_extract(lambda: soup.find("meta", property="og:description")["content"])
+def _has_ancestor(element: HtmlElement, *tags: str) -> bool:
+    return next(element.iterancestors(*tags), None) is not None
 
-    language = _safe_extract(
-        lambda: soup.find("html")["lang"].split("-")[0], default="en"
-    )
 
-    canonical = _safe_extract(
-        lambda: soup.find("link", rel="canonical")["href"], default=None
-    )
+def _text(element: HtmlElement, separator: str = "") -> str:
+    """Joins the element's stripped, non-empty text fragments with separator."""
+    return separator.join(t for t in (s.strip() for s in element.itertext()) if t)
+
+
+def _outer_html(element: HtmlElement) -> str:
+    return etree.tostring(element, method="html", encoding="unicode", with_tail=False)
+
+
+def extract_meta(
+    html: Union[str, HtmlElement], url: str, strategy: Optional[str] = None
+) -> Meta:
+    """Extracts page metadata (title, description, language, canonical, strategy)."""
+    root = make_tree(html)
+
+    title = _TITLE(root).strip() or _OG_TITLE(root).strip() or "Untitled"
+    description = _DESCRIPTION(root).strip() or _OG_DESCRIPTION(root).strip()
+    language = (root.get("lang") or "").split("-")[0].strip() or "en"
+    canonical = _CANONICAL(root).strip() or None
 
     return Meta(
         title=title,
@@ -55,28 +125,46 @@ def extract_meta(html: str, url: str, strategy: str = None) -> Meta:
     )
 
 
-def clean_html(soup: BeautifulSoup) -> None:
+def clean_html(root: HtmlElement) -> None:
     """Removes noise (scripts, styles, ads, modals, cookie banners) in-place."""
-    for selector in NOISE_SELECTORS:
-        for element in soup.select(selector):
-            element.decompose()
-
-    # Remove script and style tags
-    for tag in soup.find_all(["script", "style", "noscript"]):
-        tag.decompose()
-
-
-def classify_section_type(element: Tag) -> str:
+    for element in _NOISE_SELECTOR(root):
+        parent = element.getparent()
+        if parent is None:
+            # The document root itself matched: nothing is left
+            element.clear()
+        elif element.tail and not element.tail.isspace():
+            # A placeholder keeps the tail a separate text fragment, so it isn't
+            # glued onto the text before the dropped element ("shippingon")
+            marker = etree.ProcessingInstruction(_DROPPED_MARKER)
+            marker.tail = element.tail
+            parent.replace(element, marker)
+        else:
+            # Nested matches go with their dropped ancestor; dropping keeps the tail text
+            element.drop_tree()
+
+
+def classify_section_type(element: HtmlElement) -> str:
     """Classifies section type: hero, nav, footer, pricing, faq, list, grid, or unknown."""
     # Get element info
-    tag_name = element.name.lower() if element.name else ""
-    class_str = " ".join(element.get("class", [])).lower()
+    tag_name = element.tag.lower() if isinstance(element.tag, str) else ""
+    class_str = " ".join((element.get("class") or "").split()).lower()
     id_str = (element.get("id") or "").lower()
-
-    # Check against keywords
-    for section_type, keywords in SECTION_TYPE_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in f"{tag_name} {class_str} {id_str}":
+    return _section_type(tag_name, class_str, id_str)
+
+
+@lru_cache(maxsize=SECTION_TYPE_CACHE_SIZE)
+def _section_type(tag_name: str, class_str: str, id_str: str) -> str:
+    """Section type for a tag/class/id triple; memoized since sites reuse the same few."""
+    haystack = f"{tag_name} {class_str} {id_str}"
+
+    # Check against keywords: the highest-priority keyword found anywhere wins
+    if _SECTION_AUTOMATON is not None:
+        match = min((value for _, value in _SECTION_AUTOMATON.iter(haystack)), default=None)
+        if match:
+            return match[1]
+    else:
+        for keyword, section_type in SECTION_TYPE_FLAT:
+            if keyword in haystack:
                 return section_type
 
     # Default based on tag
@@ -92,25 +180,25 @@ def classify_section_type(element: Tag) -> str:
     return "unknown"
 
 
-def generate_label(element: Tag, section_type: str) -> str:
+def generate_label(element: HtmlElement, section_type: str) -> str:
     """
     Generate a human-readable label for the section.
     Uses heading text if available, otherwise first 5-7 words of the text.
     """
     # 1. Try to find a heading (h1-h6)
-    heading = element.find(["h1", "h2", "h3", "h4", "h5", "h6"])
-    if heading:
-        text = heading.get_text(strip=True)
+    heading = _first(element, *_HEADING_TAGS)
+    if heading is not None:
+        text = _text(heading)
         if text:
             # Truncate to ~50 chars
             return text[:50] + ("..." if len(text) > 50 else "")
 
     # 2. Derive from first 5-7 words of text content
-    # Use get_text with a separator to preserve some structure but avoid duplication
-    text = element.get_text(separator=" ", strip=True)
+    # Join text fragments with a separator to preserve some structure but avoid duplication
+    text = _text(element, " ")
     if text:
         # Clean up whitespace
-        text = re.sub(r"\s+", " ", text)
+        text = _WS_RE.sub(" ", text)
         words = text.split()[:7]
         label = " ".join(words)
         if len(words) >= 7 or len(text) > len(label):
@@ -121,17 +209,12 @@ def generate_label(element: Tag, section_type: str) -> str:
     return f"{section_type.capitalize()} Section"
 
 
-def extract_headings(element: Tag) -> list[str]:
+def extract_headings(element: HtmlElement) -> list[str]:
     """Extract all heading texts (h1-h6) from the element"""
-    headings = []
-    for tag in element.find_all(["h1", "h2", "h3", "h4", "h5", "h6"]):
-        text = tag.get_text(strip=True)
-        if text:
-            headings.append(text)
-    return headings
+    return [text for text in map(_text, element.iterdescendants(*_HEADING_TAGS)) if text]
 
 
-def extract_text(element: Tag) -> str:
+def extract_text(element: HtmlElement) -> str:
     """
     Extract clean text content from the element.
     Removes extra whitespace and joins paragraphs.
@@ -139,36 +222,53 @@ def extract_text(element: Tag) -> str:
     If the content is mostly links (>60%), returns empty string to avoid redundancy.
     """
 
-    def get_text_skipping_tags(el, tags_to_skip):
-        texts = []
-        for child in el.children:
-            if isinstance(child, NavigableString):
-                t = child.strip()
+    # Extract text skipping tables, in one iterative walk that also sums the
+    # text inside links (links are ignored entirely when within a table)
+    texts = []
+    skip_depth = 0
+    link_depth = 0
+    link_text_len = 0
+    count_links = element.tag != "table" and not _has_ancestor(element, "table")
+    for event, el in etree.iterwalk(element, events=_TEXT_WALK_EVENTS):
+        if event == "start":
+            if el.tag == "table" and el is not element:
+                skip_depth += 1
+                continue
+            if skip_depth:
+                continue
+            if el.tag == "a" and count_links and el is not element:
+                link_depth += 1
+            if el.text:
+                t = el.text.strip()
                 if t:
                     texts.append(t)
-            elif isinstance(child, Tag):
-                if child.name in tags_to_skip:
-                    continue
-                texts.append(get_text_skipping_tags(child, tags_to_skip))
-        return " ".join(texts)
+                    # Nested links each count their text, as separate anchors
+                    link_text_len += len(t) * link_depth
+            continue
 
-    # Extract text skipping tables
-    text = get_text_skipping_tags(element, ["table"])
+        if event == "end":
+            if el is element:
+                break
+            if el.tag == "table":
+                skip_depth -= 1
+            elif el.tag == "a" and count_links and not skip_depth:
+                link_depth -= 1
+
+        # Text following an element, comment or processing instruction
+        if skip_depth == 0 and el.tail:
+            t = el.tail.strip()
+            if t:
+                texts.append(t)
+                link_text_len += len(t) * link_depth
+
+    text = " ".join(texts)
 
     # Clean up whitespace
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _WS_RE.sub(" ", text).strip()
 
     if not text:
         return ""
 
-    # Check link density
-    # Calculate length of text inside links
-    link_text_len = 0
-    for a in element.find_all("a"):
-        # Only count links that are NOT inside tables (since we already skipped tables)
-        if not a.find_parent("table"):
-            link_text_len += len(a.get_text(strip=True))
-
     # Calculate density
     if len(text) > 0:
         density = link_text_len / len(text)
@@ -179,114 +279,100 @@ def extract_text(element: Tag) -> str:
     return text
 
 
-def extract_links(element: Tag, base_url: str) -> list[LinkItem]:
+def extract_links(element: HtmlElement, base_url: str) -> list[LinkItem]:
     """
     Extract all links from the element and make them absolute URLs.
     """
-    links = []
+    links: dict[str, LinkItem] = {}  # Keyed by absolute URL; keeps first-seen order
     seen_hrefs = set()
 
-    for a_tag in element.find_all("a", href=True):
-        href = a_tag["href"].strip()
+    for a_tag in _LINKS_WITH_HREF(element):
+        href = a_tag.get("href").strip()
+        # Repeated hrefs (nav, footer) resolve to a URL already kept
+        if href in seen_hrefs:
+            continue
+        seen_hrefs.add(href)
         if not href or href.startswith(("#", "javascript:", "mailto:", "tel:")):
             continue
 
-        # Make absolute URL
+        # Make absolute URL, skipping duplicates
         absolute_url = urljoin(base_url, href)
-
-        # Avoid duplicates
-        if absolute_url in seen_hrefs:
+        if absolute_url in links:
             continue
-        seen_hrefs.add(absolute_url)
 
         # Get link text
-        text = a_tag.get_text(strip=True) or absolute_url
+        text = _text(a_tag) or absolute_url
 
-        links.append(LinkItem(text=text, href=absolute_url))
+        # Both fields are plain str already; skip pydantic re-validation
+        links[absolute_url] = LinkItem.model_construct(text=text, href=absolute_url)
 
-    return links
+    return list(links.values())
 
 
-def extract_images(element: Tag, base_url: str) -> list[ImageItem]:
+def extract_images(element: HtmlElement, base_url: str) -> list[ImageItem]:
     """
     Extract all images from the element and make src absolute URLs.
     """
-    images = []
+    images: dict[str, ImageItem] = {}  # Keyed by absolute URL; keeps first-seen order
     seen_srcs = set()
 
-    for img_tag in element.find_all("img"):
+    for img_tag in element.iterdescendants("img"):
         src = img_tag.get("src") or img_tag.get("data-src", "")
         if not src:
             continue
 
         src = src.strip()
+        if src in seen_srcs:
+            continue
+        seen_srcs.add(src)
 
-        # Make absolute URL
+        # Make absolute URL, skipping duplicates
         absolute_url = urljoin(base_url, src)
-
-        # Avoid duplicates
-        if absolute_url in seen_srcs:
+        if absolute_url in images:
             continue
-        seen_srcs.add(absolute_url)
 
         # Get alt text
         alt = img_tag.get("alt", "").strip()
 
-        images.append(ImageItem(src=absolute_url, alt=alt))
+        images[absolute_url] = ImageItem.model_construct(src=absolute_url, alt=alt)
 
-    return images
+    return list(images.values())
 
 
-def extract_lists(element: Tag) -> list[list[str]]:
+def extract_lists(element: HtmlElement) -> list[list[str]]:
     """
     Extract all lists (ul, ol) as nested list structure.
     Each list becomes a List[str] of its items.
     """
     lists = []
 
-    for list_tag in element.find_all(["ul", "ol"], recursive=True):
-        # Skip nested lists (they'll be processed separately)
-        if list_tag.find_parent(["ul", "ol"]):
-            continue
-
-        items = []
-        for li in list_tag.find_all("li", recursive=False):
-            text = li.get_text(strip=True)
-            if text:
-                items.append(text)
-
+    # Nested lists are skipped (they'll be processed separately)
+    for list_tag in _TOP_LEVEL_LISTS(element):
+        items = [text for text in map(_text, list_tag.iterchildren("li")) if text]
         if items:
             lists.append(items)
 
     return lists
 
 
-def extract_tables(element: Tag) -> list[dict]:
+def extract_tables(element: HtmlElement) -> list[dict]:
     """
     Extract tables as list of dicts with headers and rows.
     """
     tables = []
 
-    for table_tag in element.find_all("table"):
+    for table_tag in element.iterdescendants("table"):
         table_data = {"headers": [], "rows": []}
 
         # Extract headers
-        thead = table_tag.find("thead")
-        if thead:
-            header_row = thead.find("tr")
-            if header_row:
-                table_data["headers"] = [
-                    th.get_text(strip=True) for th in header_row.find_all(["th", "td"])
-                ]
-
-        # Extract rows
-        tbody = table_tag.find("tbody") or table_tag
-        for tr in tbody.find_all("tr"):
-            # Skip header rows
-            if tr.find_parent("thead"):
-                continue
-
-            row = [td.get_text(strip=True) for td in tr.find_all(["td", "th"])]
+        table_data["headers"] = [_text(th) for th in _HEADER_CELLS(table_tag)]
+
+        # Extract rows, skipping header rows
+        tbody = _first(table_tag, "tbody")
+        if tbody is None:
+            tbody = table_tag
+        for tr in _BODY_ROWS(tbody):
+            row = [_text(td) for td in tr.iterdescendants("td", "th")]
             if row:
                 table_data["rows"].append(row)
 
@@ -296,18 +382,56 @@ def extract_tables(element: Tag) -> list[dict]:
     return tables
 
 
-def truncate_html(html: str, max_length: int = MAX_RAW_HTML_LENGTH) -> tuple[str, bool]:
+def _write_capped(element: HtmlElement, out: StringIO, max_length: int) -> bool:
     """
-    Truncate HTML to max_length characters.
-    Returns (truncated_html, was_truncated)
+    Writes element's HTML (without its tail) to out, descending child by child.
+    Returns False as soon as out holds more than max_length characters.
     """
-    if len(html) <= max_length:
-        return html, False
-
-    return html[:max_length] + "...", True
+    if len(element) == 0 or not isinstance(element.tag, str):
+        out.write(_outer_html(element))
+        return out.tell() <= max_length
+
+    # Start tag and leading text, serialized (and escaped) by lxml itself
+    shell = element.makeelement(element.tag, element.attrib)
+    shell.text = element.text
+    opening = _outer_html(shell)
+    closing = f"</{element.tag}>"
+    # An empty shell may be written without its (optional) end tag
+    if opening.endswith(closing):
+        opening = opening[: -len(closing)]
+    out.write(opening)
+
+    for child in element:
+        if out.tell() > max_length:
+            return False
+        # Placeholders left for dropped noise are not markup: only their tail is
+        if not _is_dropped_marker(child) and not _write_capped(child, out, max_length):
+            return False
+        if child.tail:
+            out.write(escape(child.tail))
+
+    out.write(closing)
+    return out.tell() <= max_length
+
+
+def _is_dropped_marker(node: HtmlElement) -> bool:
+    return node.tag is etree.ProcessingInstruction and node.target == _DROPPED_MARKER
+
+
+def raw_html_snippet(
+    element: HtmlElement, max_length: int = MAX_RAW_HTML_LENGTH
+) -> tuple[str, bool]:
+    """
+    Serializes element only until max_length characters are produced.
+    Returns (raw_html, was_truncated); truncated HTML ends in "...".
+    """
+    out = StringIO()
+    if _write_capped(element, out, max_length):
+        return out.getvalue(), False
+    return out.getvalue()[:max_length] + "...", True
 
 
-def extract_content(element: Tag, base_url: str) -> Content:
+def extract_content(element: HtmlElement, base_url: str) -> Content:
     """
     Extract all content from an element into a Content object.
     """
@@ -321,36 +445,41 @@ def extract_content(element: Tag, base_url: str) -> Content:
     )
 
 
-def group_by_landmarks(soup: BeautifulSoup, base_url: str) -> list[Section]:
+def _extract_contents(elements: list[HtmlElement], base_url: str) -> list[Content]:
     """
-    Group content into sections using HTML5 landmarks (header, nav, main, section, article, footer).
+    extract_content for each element, in order. With PARALLEL_EXTRACT_WORKERS
+    set and enough elements, they are spread over a thread pool; extraction
+    only reads the tree, so threads can share it.
     """
-    sections = []
-    section_counter = 0
-
-    # Find landmark elements
-    landmarks = soup.find_all(
-        ["header", "nav", "main", "section", "article", "aside", "footer"]
-    )
-
-    for element in landmarks:
-        # Skip if this element is inside another landmark (avoid nesting)
-        if element.find_parent(
-            ["header", "nav", "main", "section", "article", "footer"]
-        ):
-            continue
+    if PARALLEL_EXTRACT_WORKERS < 2 or len(elements) < PARALLEL_EXTRACT_MIN_LANDMARKS:
+        return [extract_content(element, base_url) for element in elements]
+    with ThreadPoolExecutor(max_workers=min(PARALLEL_EXTRACT_WORKERS, len(elements))) as pool:
+        return list(pool.map(extract_content, elements, repeat(base_url)))
 
-        section_type = classify_section_type(element)
-        label = generate_label(element, section_type)
 
-        # Generate section ID
-        section_id = f"{section_type}-{section_counter}"
-        section_counter += 1
+def group_by_landmarks(
+    root: HtmlElement, base_url: str, min_sections: int = 0
+) -> list[Section]:
+    """
+    Group content into sections using HTML5 landmarks (header, nav, main, section, article, footer).
+    Returns [] without extracting anything if there are fewer than min_sections landmarks.
+    """
+    sections = []
 
-        # Extract content
-        content = extract_content(element, base_url)
+    # Find landmark elements, skipping those inside another landmark (avoid nesting)
+    landmarks = [
+        element
+        for element in root.iterdescendants(*_LANDMARK_TAGS)
+        if not _has_ancestor(element, *_LANDMARK_PARENT_TAGS)
+    ]
+    if len(landmarks) < min_sections:
+        return sections
 
-        # Skip empty sections
+    # Extract content; skipped sections still consume an ID number
+    for section_number, (element, content) in enumerate(
+        zip(landmarks, _extract_contents(landmarks, base_url))
+    ):
+        # Skip empty sections before classifying, labelling or serializing them
         if (
             not content.text
             and not content.headings
@@ -360,9 +489,14 @@ def group_by_landmarks(soup: BeautifulSoup, base_url: str) -> list[Section]:
         ):
             continue
 
+        section_type = classify_section_type(element)
+        label = generate_label(element, section_type)
+
+        # Generate section ID
+        section_id = f"{section_type}-{section_number}"
+
         # Get raw HTML
-        raw_html = str(element)
-        raw_html, truncated = truncate_html(raw_html)
+        raw_html, truncated = raw_html_snippet(element)
 
         sections.append(
             Section(
@@ -379,7 +513,7 @@ def group_by_landmarks(soup: BeautifulSoup, base_url: str) -> list[Section]:
     return sections
 
 
-def group_by_headings(soup: BeautifulSoup, base_url: str) -> list[Section]:
+def group_by_headings(root: HtmlElement, base_url: str) -> list[Section]:
     """
     Group content into sections using headings (h1-h3).
     Everything between two headings becomes a section.
@@ -388,39 +522,42 @@ def group_by_headings(soup: BeautifulSoup, base_url: str) -> list[Section]:
     section_counter = 0
 
     # Find all top-level headings
-    headings = soup.find_all(["h1", "h2", "h3"])
+    headings = list(root.iterdescendants("h1", "h2", "h3"))
 
-    for i, heading in enumerate(headings):
-        # Get all siblings until next heading
-        content_elements = []
-        current = heading.next_sibling
+    # Per parent: its element children, each child's index and, per index,
+    # where the next h1-h3 sibling starts - built once, not walked per heading
+    sibling_index = {}
 
-        while current:
-            # Stop at next heading of same or higher level
-            if isinstance(current, Tag) and current.name in ["h1", "h2", "h3"]:
-                break
-
-            if isinstance(current, Tag):
-                content_elements.append(current)
-
-            current = current.next_sibling
-
-        # Create a wrapper for this section
-        wrapper = soup.new_tag("div")
-        wrapper.append(heading)
-        for elem in content_elements:
-            # Clone the element to avoid modifying original
-            wrapper.append(elem)
-
-        section_type = "section"
-        label = heading.get_text(strip=True)[:50]
+    for i, heading in enumerate(headings):
+        parent = heading.getparent()
+        if parent not in sibling_index:
+            children = [child for child in parent if isinstance(child.tag, str)]
+            next_heading = [len(children)] * len(children)
+            for j in range(len(children) - 2, -1, -1):
+                following = children[j + 1]
+                next_heading[j] = j + 1 if following.tag in ["h1", "h2", "h3"] else next_heading[j + 1]
+            positions = {child: j for j, child in enumerate(children)}
+            sibling_index[parent] = (children, positions, next_heading)
+        children, positions, next_heading = sibling_index[parent]
+
+        # Get all element siblings until next heading of same or higher level
+        position = positions[heading]
+        content_elements = children[position + 1 : next_heading[position]]
+
+        # Create a wrapper for this section from copies, leaving the document
+        # untouched; tail text stays out, as only elements belong to the section
+        wrapper = root.makeelement("div")
+        for elem in [heading, *content_elements]:
+            clone = copy.deepcopy(elem)
+            clone.tail = None
+            wrapper.append(clone)
 
         section_id = f"heading-section-{section_counter}"
         section_counter += 1
 
         content = extract_content(wrapper, base_url)
 
-        # Skip empty sections
+        # Skip empty sections before labelling or serializing them
         if (
             not content.text
             and not content.headings
@@ -430,8 +567,10 @@ def group_by_headings(soup: BeautifulSoup, base_url: str) -> list[Section]:
         ):
             continue
 
-        raw_html = str(wrapper)
-        raw_html, truncated = truncate_html(raw_html)
+        section_type = "section"
+        label = _text(heading)[:50]
+
+        raw_html, truncated = raw_html_snippet(wrapper)
 
         sections.append(
             Section(
@@ -448,7 +587,7 @@ def group_by_headings(soup: BeautifulSoup, base_url: str) -> list[Section]:
     return sections
 
 
-def parse_html(html: str, url: str) -> list[Section]:
+def parse_html(html: Union[str, HtmlElement], url: str) -> list[Section]:
     """
     Main parsing function - converts HTML to list of Sections.
     This is the unified parser used by both static and dynamic scrapers.
@@ -460,30 +599,35 @@ def parse_html(html: str, url: str) -> list[Section]:
     4. If still insufficient, create single section from main content
 
     Args:
-        html: Raw HTML string
+        html: Raw HTML string, or a tree from make_tree (cleaned in place)
         url: Source URL for making links absolute
 
     Returns:
         List of Section objects
     """
-    soup = BeautifulSoup(html, "lxml")
+    root = make_tree(html)
 
     # Clean noise
-    clean_html(soup)
+    clean_html(root)
 
-    # Try landmark-based grouping first
-    sections = group_by_landmarks(soup, url)
+    # Try landmark-based grouping first; pages with fewer than two landmarks
+    # can't pass the check below, so they skip straight to headings
+    sections = group_by_landmarks(root, url, min_sections=2)
 
     # If we got good sections, return them
     if len(sections) >= 2:
         return sections
 
     # Fallback to heading-based grouping
-    sections = group_by_headings(soup, url)
+    sections = group_by_headings(root, url)
 
     # If still insufficient, create a single section from body/main
     if not sections:
-        main_element = soup.find("main") or soup.find("body") or soup
+        main_element = _first(root, "main")
+        if main_element is None:
+            main_element = _first(root, "body")
+        if main_element is None:
+            main_element = root
 
         content = extract_content(main_element, url)
 
@@ -495,8 +639,7 @@ def parse_html(html: str, url: str) -> list[Section]:
             or content.tables
             or content.images
         ):
-            raw_html = str(main_element)[:MAX_RAW_HTML_LENGTH]
-            raw_html, truncated = truncate_html(raw_html)
+            raw_html, truncated = raw_html_snippet(main_element)
 
             sections.append(
                 Section(
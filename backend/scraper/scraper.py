@@ -2,9 +2,15 @@
 Main scraping orchestrator - coordinates static and dynamic scraping with fallback
 """
 
+import asyncio
 from datetime import datetime, timezone
+from typing import Optional
 
+import httpx
+
+from backend.config import STRICT_ROBOTS_CHECK
 from backend.models import ScrapeResult, ScrapeError, Meta, Interactions
+from backend.scraper.browser import ContextPool
 from backend.scraper.dynamic import scrape_dynamic
 from backend.scraper.static import scrape_static
 from backend.scraper.utils import validate_url, check_robots_txt
@@ -23,7 +29,11 @@ def _error_result(url: str, errors: list[ScrapeError]) -> ScrapeResult:
 
 
 async def scrape_url(
-    url: str, enable_interactions: bool = False, interaction_strategy: str = "auto"
+    url: str,
+    enable_interactions: bool = False,
+    interaction_strategy: str = "auto",
+    context_pool: Optional[ContextPool] = None,
+    client: Optional[httpx.AsyncClient] = None,
 ) -> ScrapeResult:
     """
     Scrapes a URL with intelligent static→dynamic fallback.
@@ -33,15 +43,26 @@ async def scrape_url(
         url: Target URL
         enable_interactions: Enable depth ≥ 3 interactions (tabs, pagination, etc.)
         interaction_strategy: 'auto', 'tabs', 'load_more', 'scroll', 'pagination', or 'all'
+        context_pool: Shared pool of browser contexts reused for JS rendering (optional)
+        client: HTTP client for the static fetch and robots.txt check (defaults to get_client())
     """
     # Validate URL
     is_valid, error_msg = validate_url(url)
     if not is_valid:
         return _error_result(url, [ScrapeError(message=error_msg, phase="validation")])
 
-    # Check robots.txt compliance
-    is_allowed, robots_msg = await check_robots_txt(url)
+    # Check robots.txt compliance; unless STRICT_ROBOTS_CHECK, the static fetch
+    # runs alongside it and is discarded if disallowed (browser navigation
+    # always waits for the verdict)
+    static_task = (
+        None
+        if enable_interactions or STRICT_ROBOTS_CHECK
+        else asyncio.create_task(scrape_static(url, client=client))
+    )
+    is_allowed, robots_msg = await check_robots_txt(url, client=client)
     if not is_allowed:
+        if static_task:
+            static_task.cancel()
         return _error_result(url, [ScrapeError(message=robots_msg, phase="validation")])
 
     errors = []
@@ -50,12 +71,15 @@ async def scrape_url(
         # If interactions enabled, skip static and go directly to Playwright
         if enable_interactions:
             dynamic_result = await scrape_dynamic(
-                url, enable_interactions=True, interaction_strategy=interaction_strategy
+                url,
+                enable_interactions=True,
+                interaction_strategy=interaction_strategy,
+                context_pool=context_pool,
             )
             return dynamic_result or _error_result(url, errors)
         
         # Try static scraping first
-        static_result, needs_js = await scrape_static(url)
+        static_result, needs_js = await (static_task or scrape_static(url, client=client))
 
         if static_result and not needs_js:
             return static_result
@@ -68,7 +92,10 @@ async def scrape_url(
             )
         )
         dynamic_result = await scrape_dynamic(
-            url, enable_interactions=needs_js, interaction_strategy=interaction_strategy
+            url,
+            enable_interactions=needs_js,
+            interaction_strategy=interaction_strategy,
+            context_pool=context_pool,
         )
         
         result = dynamic_result or static_result
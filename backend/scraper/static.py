@@ -1,4 +1,4 @@
-"""Fast static scraping: httpx + BeautifulSoup."""
+"""Fast static scraping: httpx + lxml."""
 
 __all__ = ["scrape_static"]
 
@@ -7,28 +7,41 @@ from typing import Optional, Tuple
 
 import httpx
 
-from backend.config import STATIC_TIMEOUT, DEFAULT_HEADERS
+from backend.config import JS_PREFILTER_CHARS, STATIC_TIMEOUT
 from backend.models import ScrapeResult, Meta, ScrapeError, Interactions
-from backend.scraper.parser import parse_html, extract_meta
-from backend.scraper.utils import needs_js_rendering
+from backend.scraper.http_client import get_client
+from backend.scraper.parser import make_tree, parse_html, extract_meta
+from backend.scraper.utils import markup_needs_js, needs_js_rendering
 
 
-async def scrape_static(url: str) -> Tuple[Optional[ScrapeResult], bool]:
+async def scrape_static(
+    url: str, client: Optional[httpx.AsyncClient] = None
+) -> Tuple[Optional[ScrapeResult], bool]:
     """
-    Fast HTTP-based scraping with BeautifulSoup.
+    Fast HTTP-based scraping with lxml.
+    Uses the given client, otherwise the shared one from get_client().
+    The body is streamed; an SPA page is dropped once its head gives it away.
     Returns (ScrapeResult | None, needs_js_flag).
     """
     errors = []
 
     try:
-        # Fetch HTML with httpx
-        async with httpx.AsyncClient(
-            follow_redirects=True, timeout=STATIC_TIMEOUT, headers=DEFAULT_HEADERS
-        ) as client:
-            response = await client.get(url)
+        # Stream HTML with httpx; an SPA head ends the download early
+        client = client or await get_client()
+        chunks = []
+        received = 0
+        head_checked = False
+        async with client.stream("GET", url) as response:
             response.raise_for_status()
-            html = response.text
-            final_url = str(response.url)
+            async for chunk in response.aiter_text():
+                chunks.append(chunk)
+                received += len(chunk)
+                if not head_checked and received >= JS_PREFILTER_CHARS:
+                    head_checked = True
+                    if markup_needs_js("".join(chunks)):
+                        return None, True
+        html = "".join(chunks)
+        final_url = str(response.url)
     except httpx.TimeoutException:
         errors.append(
             ScrapeError(
@@ -52,13 +65,18 @@ async def scrape_static(url: str) -> Tuple[Optional[ScrapeResult], bool]:
 
     # Check if JS rendering is needed
     try:
-        requires_js = needs_js_rendering(html)
+        if not head_checked and markup_needs_js(html):
+            return None, True
+
+        # Parse once, shared by every step below
+        root = make_tree(html)
+        requires_js = needs_js_rendering(html, root)
         if requires_js:
             return None, True
 
         # Extract metadata and parse HTML
-        meta = extract_meta(html, final_url, strategy="static")
-        sections = parse_html(html, final_url)
+        meta = extract_meta(root, final_url, strategy="static")
+        sections = parse_html(root, final_url)
 
         # Create result
         return (
@@ -1,65 +1,197 @@
 """Validation, robots.txt checks, and JS detection heuristics."""
 
-__all__ = ["check_robots_txt", "validate_url", "needs_js_rendering"]
+__all__ = ["check_robots_txt", "validate_url", "needs_js_rendering", "markup_needs_js"]
 
 import re
-from typing import Tuple
+from typing import List, Optional, Tuple
 from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
 
+try:
+    import hyperscan
+except ImportError:  # Optional speedup; the markup prefilter then always runs its regexes
+    hyperscan = None
 import httpx
-from bs4 import BeautifulSoup
+from cachetools import TTLCache
+from lxml import etree
+from lxml.html import HtmlElement
 
 from backend.config import (
+    BUNDLER_SRC_RE,
     JS_REQUIRED_PHRASES,
+    JS_REQUIRED_RE,
+    NOSCRIPT_JS_RE,
     MIN_CONTENT_LENGTH,
+    JS_PREFILTER_CHARS,
     ROBOTS_TXT_TIMEOUT,
+    ROBOTS_CACHE_SIZE,
+    ROBOTS_CACHE_TTL,
     MIN_SEMANTIC_CONTENT_LENGTH,
     MAX_SCRIPT_COUNT_THRESHOLD,
 )
+from backend.scraper.cache import SingleFlight
+from backend.scraper.http_client import get_client
+from backend.scraper.parser import make_tree
 
+_WS_RE = re.compile(r"\s+")
 
-async def check_robots_txt(url: str, user_agent: str = "*") -> Tuple[bool, str]:
-    """Checks robots.txt compliance. Returns (is_allowed, message)."""
+# (parsed rules | None, status) per scheme://netloc; concurrent misses per host share one fetch
+_robots_cache: TTLCache = TTLCache(maxsize=ROBOTS_CACHE_SIZE, ttl=ROBOTS_CACHE_TTL)
+_robots_flights = SingleFlight()
+
+# Document-level probes, compiled once
+_SPA_MARKERS = etree.XPath(
+    "boolean(//*[@id='__next' or @id='___gatsby' or @id='root' or @id='app'"
+    " or @data-reactroot or @data-react-helmet or @data-v-app"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' react-root ')])"
+)
+# Raw-markup prefilters over the first JS_PREFILTER_CHARS, checked before any
+# parse. Comments, <!...>/<?...> declarations and script/style/template bodies
+# are cut first. Markers must then be an attribute of a start tag (names are
+# case-insensitive like the parser's, id values exact like @id=) and phrases
+# must sit outside any tag, so only what the tree probes below would see can
+# match. A miss just falls through to them.
+_HIDDEN_BLOCK_RE = re.compile(
+    r"<!--.*?(?:-->|\Z)|<(script|style|template)\b.*?(?:</\1\s*>|\Z)|<[!?][^>]*(?:>|\Z)",
+    re.I | re.S,
+)
+# Quotes only delimit a value right after "="; elsewhere they are plain characters.
+# The lookahead plus backreference keeps the attribute run from being backtracked into.
+_TAG_RE = re.compile(r"""<[a-z/](?=((?:=\s*"[^"]*"|=\s*'[^']*'|[^>])*))\1(?:>|\Z)""", re.I)
+_SPA_ROOT_IDS = "__next|___gatsby|root|app"
+# One attribute other than id (the parser keeps the first of duplicate attributes)
+_OTHER_ATTR = (
+    r"""(?!(?i:id)[\s=/>])[^\s"'<>/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'>][^\s>]*))?"""
+)
+_SPA_MARKER_RE = re.compile(
+    rf"<[a-zA-Z][^\s/>]*(?:\s+{_OTHER_ATTR})*?\s+"
+    r"(?:(?i:data-reactroot|data-react-helmet|data-v-app)(?=[\s=/>])|(?i:id)\s*=\s*"
+    rf"""(?:"(?:{_SPA_ROOT_IDS})"|'(?:{_SPA_ROOT_IDS})'|(?:{_SPA_ROOT_IDS})(?=[\s>])))"""
+)
+
+
+def _build_marker_database():
+    """Hyperscan database matching anything the markup prefilter regexes could match."""
+    expressions = [
+        b"data-reactroot",
+        b"data-react-helmet",
+        b"data-v-app",
+        rf"id\s*=\s*[\"']?(?:{_SPA_ROOT_IDS})".encode(),
+    ] + [re.escape(phrase).encode() for phrase in JS_REQUIRED_PHRASES]
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions),
+    )
+    return database
+
+
+_MARKER_DATABASE = _build_marker_database() if hyperscan else None
+
+
+def _may_have_markers(head: str) -> bool:
+    """
+    Vectorized pre-scan of the raw head for SPA markers and JS-required phrases.
+    False skips the prefilter regexes: no marker can match, and a phrase split by
+    tags or comments is still caught by the tree probes. True (or no hyperscan)
+    means run them.
+    """
+    if _MARKER_DATABASE is None:
+        return True
+    found = False
+
+    def on_match(*_) -> bool:
+        nonlocal found
+        found = True
+        return True  # Stop at the first hit
+
+    try:
+        _MARKER_DATABASE.scan(head.encode("utf-8", "surrogatepass"), match_event_handler=on_match)
+    except hyperscan.error:
+        # Scan terminated by on_match, or failed; either way let the regexes decide
+        return True
+    return found
+
+# Single-walk content analysis: iterwalk only reports comments/PIs when asked
+_JS_WALK_EVENTS = ("start", "end", "comment", "pi")
+_HIDDEN_TEXT_TAGS = frozenset(("script", "style", "template"))  # text a browser never shows
+_NON_CONTENT_TAGS = frozenset(("script", "style", "noscript"))  # left out of the content length
+_SEMANTIC_TAGS = frozenset(("main", "article"))
+_RUN_BREAK = "\x00"  # Separates content text runs; parsed text never contains NUL
+
+
+async def _get_robots_rules(
+    origin: str, client: Optional[httpx.AsyncClient]
+) -> Tuple[Optional[RobotFileParser], int]:
+    """
+    Returns (parsed rules | None, HTTP status) for origin's robots.txt.
+    200 and 404 answers are cached per origin; concurrent misses share one fetch.
+    """
+    cached = _robots_cache.get(origin)
+    if cached is not None:
+        return cached
+
+    async with _robots_flights.hold(origin):
+        # Another check may have fetched it while we waited
+        cached = _robots_cache.get(origin)
+        if cached is not None:
+            return cached
+
+        client = client or await get_client()
+        response = await client.get(f"{origin}/robots.txt", timeout=ROBOTS_TXT_TIMEOUT)
+        if response.status_code != 200:
+            rules = None
+        else:
+            rules = RobotFileParser()
+            rules.parse(response.text.splitlines())
+
+        # Other statuses may be transient, so they are fetched again next time
+        if response.status_code in (200, 404):
+            _robots_cache[origin] = (rules, response.status_code)
+        return rules, response.status_code
+
+
+async def check_robots_txt(
+    url: str, user_agent: str = "*", client: Optional[httpx.AsyncClient] = None
+) -> Tuple[bool, str]:
+    """
+    Checks robots.txt compliance. Returns (is_allowed, message).
+    Uses the given client, otherwise the shared one from get_client().
+    """
     # Validate user_agent parameter
     if not user_agent or not user_agent.strip():
         user_agent = "*"
     
     try:
         parsed = urlparse(url)
-        robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-
-        # Fetch robots.txt with timeout
-        async with httpx.AsyncClient(timeout=ROBOTS_TXT_TIMEOUT) as client:
-            try:
-                response = await client.get(robots_url)
-                if response.status_code == 404:
-                    # No robots.txt means all allowed
-                    return True, "No robots.txt found - scraping allowed"
+        origin = f"{parsed.scheme}://{parsed.netloc}"
 
-                if response.status_code != 200:
-                    # Other errors - allow but warn
-                    return (
-                        True,
-                        f"Could not fetch robots.txt (status {response.status_code}) - proceeding anyway",
-                    )
+        # Fetch robots.txt with timeout (or reuse this host's cached copy)
+        try:
+            rules, status = await _get_robots_rules(origin, client)
+            if status == 404:
+                # No robots.txt means all allowed
+                return True, "No robots.txt found - scraping allowed"
 
-                # Parse robots.txt
-                rp = RobotFileParser()
-                rp.parse(response.text.splitlines())
+            if status != 200:
+                # Other errors - allow but warn
+                return (
+                    True,
+                    f"Could not fetch robots.txt (status {status}) - proceeding anyway",
+                )
 
-                # Check if our path is allowed
-                is_allowed = rp.can_fetch(user_agent, url)
+            # Check if our path is allowed
+            is_allowed = rules.can_fetch(user_agent, url)
 
-                if not is_allowed:
-                    return False, "URL disallowed by robots.txt"
+            if not is_allowed:
+                return False, "URL disallowed by robots.txt"
 
-                return True, "Robots.txt allows scraping"
+            return True, "Robots.txt allows scraping"
 
-            except httpx.TimeoutException:
-                return True, "Robots.txt fetch timeout - proceeding anyway"
-            except Exception as e:
-                return True, f"Error checking robots.txt: {str(e)} - proceeding anyway"
+        except httpx.TimeoutException:
+            return True, "Robots.txt fetch timeout - proceeding anyway"
+        except Exception as e:
+            return True, f"Error checking robots.txt: {str(e)} - proceeding anyway"
 
     except Exception as e:
         return True, f"Error parsing robots.txt URL: {str(e)} - proceeding anyway"
@@ -86,7 +218,20 @@ def validate_url(url: str) -> Tuple[bool, str]:
         return False, f"Invalid URL: {str(e)}"
 
 
-def needs_js_rendering(html: str) -> bool:
+def markup_needs_js(html: str) -> bool:
+    """
+    True when the first JS_PREFILTER_CHARS of raw html already show an SPA root
+    or a JS-required notice. Needs no parse and works on a partial download;
+    False decides nothing.
+    """
+    head = html[:JS_PREFILTER_CHARS]
+    if not _may_have_markers(head):
+        return False
+    head = _HIDDEN_BLOCK_RE.sub("", head)
+    return bool(_SPA_MARKER_RE.search(head) or JS_REQUIRED_RE.search(_TAG_RE.sub("", head)))
+
+
+def needs_js_rendering(html: str, root: Optional[HtmlElement] = None) -> bool:
     """Heuristic detection: SPA markers, low content, high script count."""
     """
     Heuristic to determine if page needs JavaScript rendering.
@@ -99,93 +244,108 @@ def needs_js_rendering(html: str) -> bool:
     - High script-to-content ratio
     - Heavy bundled scripts with low text ratio
 
+    Pass root to reuse an existing parse of html; it is not modified.
+
     Returns True if Playwright should be used.
     """
-    soup = BeautifulSoup(html, "lxml")
+    if root is None:
+        # 0) Cheap markup scan; a hit decides without building a tree
+        if markup_needs_js(html):
+            return True
+        root = make_tree(html)
 
     # 1) Check for SPA/CSR framework markers
-    # React/Next.js/Gatsby
-    if soup.find(id="__next") or soup.find(id="___gatsby"):
-        return True
-    if soup.find(attrs={"data-reactroot": True}) or soup.find(
-        attrs={"data-react-helmet": True}
-    ):
-        return True
-    # Generic SPA roots
-    if soup.find(id="root") or soup.find(id="app") or soup.find(class_="react-root"):
-        return True
-    # Vue.js
-    if soup.find(id="app", attrs={"data-v-app": True}):
+    # React/Next.js/Gatsby, data-v-app (Vue.js) roots and generic SPA roots
+    if _SPA_MARKERS(root):
         return True
 
-    # 2) Check for JS required messages (from noscript or main text)
-    noscripts = " ".join(
-        ns.get_text(" ", strip=True).lower() for ns in soup.find_all("noscript")
-    )
-    if (
-        "enable javascript" in noscripts
-        or "without javascript" in noscripts
-        or "javascript is required" in noscripts
-    ):
+    # 2) One walk gathers scripts, noscript/visible text, content text and
+    # semantic markers. Content is the visible text minus noscript subtrees;
+    # text on either side of a skipped subtree joins into one run, as if the
+    # subtree had been dropped from the tree.
+    script_count = 0
+    has_heavy_bundles = False
+    has_semantic = False
+    noscript_text: List[str] = []
+    visible_text: List[str] = []
+    content_text: List[str] = []
+    hidden = noscript = skipped = 0
+
+    for event, el in etree.iterwalk(root, events=_JS_WALK_EVENTS):
+        tag = el.tag
+        if event == "start":
+            if tag in _NON_CONTENT_TAGS:
+                skipped += 1
+            elif not skipped:
+                content_text.append(_RUN_BREAK)
+                if tag in _SEMANTIC_TAGS or el.get("role") == "main":
+                    has_semantic = True
+            if tag == "script":
+                script_count += 1
+                # Check for bundled script patterns (webpack, next, vite, etc.)
+                src = el.get("src")
+                if src and not has_heavy_bundles and BUNDLER_SRC_RE.search(src):
+                    has_heavy_bundles = True
+            elif tag == "noscript":
+                noscript += 1
+            if tag in _HIDDEN_TEXT_TAGS:
+                hidden += 1
+            text = el.text
+        else:
+            if event == "end":
+                if tag in _HIDDEN_TEXT_TAGS:
+                    hidden -= 1
+                if tag == "noscript":
+                    noscript -= 1
+                if tag in _NON_CONTENT_TAGS:
+                    skipped -= 1
+                elif not skipped:
+                    content_text.append(_RUN_BREAK)
+            elif not skipped:
+                # Comment or processing instruction: its tail is a separate text node
+                content_text.append(_RUN_BREAK)
+            text = el.tail
+
+        if text:
+            if noscript:
+                noscript_text.append(text)
+            if not hidden:
+                visible_text.append(text)
+                if not skipped:
+                    content_text.append(text)
+
+    # 3) Check for JS required messages (from noscript or main text)
+    if NOSCRIPT_JS_RE.search(" ".join(t for t in (s.strip() for s in noscript_text) if t)):
         return True
 
-    text = soup.get_text().lower()
-    if any(phrase in text for phrase in JS_REQUIRED_PHRASES):
+    if JS_REQUIRED_RE.search("".join(visible_text)):
         return True
 
-    # 3) Analyze script tags before removing them
-    scripts = soup.find_all("script")
-    script_count = len(scripts)
-
-    # Check for bundled script patterns (webpack, next, vite, etc.)
-    bundler_keywords = (
-        "bundle",
-        "chunk",
-        "webpack",
-        "main.",
-        "next",
-        "app.",
-        "vendor",
-        "_next",
-        "vite",
-    )
-    # Use generator to avoid building intermediate list
-    has_heavy_bundles = any(
-        any(k in s.get("src", "").lower() for k in bundler_keywords)
-        for s in scripts
-        if s.get("src")
-    )
-
-    # 4) Remove script and style tags for content analysis
-    for tag in soup.find_all(["script", "style", "noscript"]):
-        tag.decompose()
-
-    # 5) Compute text-to-HTML ratio
-    clean_text = soup.get_text(separator=" ", strip=True)
-    clean_text = re.sub(r"\s+", " ", clean_text)
+    # 4) Compute text-to-HTML ratio
+    runs = "".join(content_text).split(_RUN_BREAK)
+    clean_text = " ".join(t for t in (s.strip() for s in runs) if t)
+    clean_text = _WS_RE.sub(" ", clean_text)
     content_length = len(clean_text)
     html_len = max(len(html), 1)
     text_ratio = content_length / html_len
 
-    # 6) Too little content
+    # 5) Too little content
     if content_length < MIN_CONTENT_LENGTH:
         return True
 
-    # 7) No semantic markers
-    if not (
-        soup.find("main") or soup.find("article") or soup.find(attrs={"role": "main"})
-    ):
+    # 6) No semantic markers
+    if not has_semantic:
         return True
 
-    # 8) Heavy JS with low text ratio (likely CSR shell)
+    # 7) Heavy JS with low text ratio (likely CSR shell)
     if has_heavy_bundles and script_count > 10 and text_ratio < 0.03:
         return True
 
-    # 9) Very high script count with low text ratio
+    # 8) Very high script count with low text ratio
     if script_count > 30 and text_ratio < 0.05:
         return True
 
-    # 10) Original script-to-content ratio check
+    # 9) Original script-to-content ratio check
     if (
         script_count > MAX_SCRIPT_COUNT_THRESHOLD
         and content_length < MIN_SEMANTIC_CONTENT_LENGTH
@@ -0,0 +1,54 @@
+"""Checks for the single-flight result cache in backend.scraper.cache."""
+
+import asyncio
+import unittest
+
+from backend.models import Meta, ScrapeResult
+from backend.scraper.cache import ScrapeCache
+
+
+def _result() -> ScrapeResult:
+    return ScrapeResult(
+        url="https://example.com/",
+        scrapedAt="2024-01-01T00:00:00Z",
+        meta=Meta(title="Example", description="", language="en"),
+    )
+
+
+class GetOrScrapeTest(unittest.TestCase):
+    def test_lock_outlives_a_release_with_queued_waiters(self):
+        cache = ScrapeCache()
+        calls = []
+        late_callers = []
+
+        async def failing_scrape():
+            calls.append("first")
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        async def late_scrape():
+            calls.append("late")
+            return _result()
+
+        async def second_scrape():
+            calls.append("second")
+            # A caller arriving now must wait for this scrape, not start its own
+            late_callers.append(asyncio.create_task(cache.get_or_scrape("k", late_scrape)))
+            await asyncio.sleep(0)
+            return _result()
+
+        async def main():
+            first = asyncio.create_task(cache.get_or_scrape("k", failing_scrape))
+            second = asyncio.create_task(cache.get_or_scrape("k", second_scrape))
+            with self.assertRaises(RuntimeError):
+                await first
+            result = await second
+            self.assertIs(await late_callers[0], result)
+
+        asyncio.run(main())
+        self.assertEqual(calls, ["first", "second"])
+        self.assertEqual(len(cache._flights), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+"""Checks for the shared httpx client in backend.scraper.http_client."""
+
+import asyncio
+import unittest
+
+from backend.scraper.http_client import close_client, get_client
+
+
+class GetClientTest(unittest.TestCase):
+    def test_each_event_loop_gets_its_own_client(self):
+        async def fetch_twice():
+            client = await get_client()
+            self.assertIs(await get_client(), client)
+            await close_client()
+            self.assertTrue(client.is_closed)
+            return client
+
+        first = asyncio.run(fetch_twice())
+        second = asyncio.run(fetch_twice())
+        self.assertIsNot(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+"""Checks for the HTML→Section parser in backend.scraper.parser."""
+
+import unittest
+
+from backend.scraper.parser import parse_html
+
+
+class CleanHtmlTest(unittest.TestCase):
+    def test_dropped_inline_script_keeps_words_apart(self):
+        html = (
+            "<html><body><main>"
+            "<p>Free shipping<script>t()</script>on all orders over $50</p>"
+            "</main></body></html>"
+        )
+        (section,) = parse_html(html, "https://example.com/")
+        self.assertEqual(section.content.text, "Free shipping on all orders over $50")
+        self.assertNotIn("<?", section.rawHtml)
+
+
+if __name__ == "__main__":
+    unittest.main()
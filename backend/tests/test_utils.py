@@ -0,0 +1,78 @@
+"""Checks for the JS-rendering heuristics in backend.scraper.utils."""
+
+import random
+import unittest
+
+from backend.scraper.parser import make_tree
+from backend.scraper.utils import markup_needs_js, needs_js_rendering
+
+_CONTENT = "<main>" + "lorem ipsum dolor sit amet " * 40 + "</main>"
+
+# Markup fragments that stress the raw-markup prefilter
+_FRAGMENTS = [
+    '<div id="root">',
+    "<div id=app>",
+    "<div id='__next' class=x>",
+    '<div id="root page">',
+    "<div data-v-app>",
+    '<div id="Root">',
+    "<main id=APP>",
+    "<main data-reactroot-x>",
+    "<DIV ID=root>",
+    "<div DATA-V-APP>",
+    "<p id=root/>",
+    '<div id="x" id="root">',
+    "<div title='a id=\"root\" b'>",
+    '<div title="a id=root b">',
+    '<div title="a>enable javascript">',
+    "<![CDATA[ <div id=root> ]]>",
+    "<!x <div id=root>",
+    "<?php <div id=root> ?>",
+    "<div/id=root>",
+    '<div id=root">',
+    '<script>var s="<div id=root>";document.write("please enable javascript")</script>',
+    "<!-- enable javascript -->",
+    "<!-- <div id=root> -->",
+    "<p>Please enable JavaScript</p>",
+    '<img alt="enable javascript">',
+    "<p>enable <b>javascript</b></p>",
+    "<template>requires javascript <div id=root></template>",
+    "<noscript>enable javascript</noscript>",
+    '<p data-id="root">hi</p>',
+    '<div a"b id=root>',
+    '<div data-react-helmet=true>',
+    "<div title='x'id=root>",
+    '<a href="/x?id=root">l</a>',
+    "<",
+    ">",
+    '"',
+    "=",
+    " id=root ",
+    "</div>",
+]
+
+
+def _page(markup: str) -> str:
+    return f"<html><body>{markup}{_CONTENT}</body></html>"
+
+
+class MarkupNeedsJsTest(unittest.TestCase):
+    def test_attribute_names_ignore_case_but_id_values_do_not(self):
+        self.assertTrue(markup_needs_js(_page("<DIV ID=root>")))
+        self.assertTrue(markup_needs_js(_page("<div DATA-REACTROOT>")))
+        for markup in ('<div id="Root">', "<main id=APP>", "<main data-reactroot-x>"):
+            with self.subTest(markup=markup):
+                html = _page(markup)
+                self.assertFalse(markup_needs_js(html))
+                self.assertFalse(needs_js_rendering(html))
+
+    def test_prefilter_hit_implies_tree_decision(self):
+        rng = random.Random(0)
+        for _ in range(5000):
+            html = _page("".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(1, 10))))
+            if markup_needs_js(html):
+                self.assertTrue(needs_js_rendering(html, make_tree(html)), html)
+
+
+if __name__ == "__main__":
+    unittest.main()